@@ -6,11 +6,15 @@ import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 from datetime import datetime
 import requests
 import asyncio
+import json
+import time
+import zlib
+from collections import OrderedDict
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -25,6 +29,15 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/"
 
+# TMDB response cache and warm-start snapshot configuration
+TMDB_CACHE_TTL = int(os.getenv("TMDB_CACHE_TTL", "3600"))
+TMDB_CACHE_MAX_ENTRIES = int(os.getenv("TMDB_CACHE_MAX_ENTRIES", "2000"))
+TMDB_SNAPSHOT_PATH = Path(os.getenv("TMDB_SNAPSHOT_PATH", str(ROOT_DIR / "tmdb_cache.snapshot")))
+TMDB_SNAPSHOT_INTERVAL = int(os.getenv("TMDB_SNAPSHOT_INTERVAL", "300"))
+# Only the most recently used entries are snapshotted so startup stays fast
+TMDB_SNAPSHOT_MAX_ENTRIES = int(os.getenv("TMDB_SNAPSHOT_MAX_ENTRIES", "250"))
+TMDB_SNAPSHOT_VERSION = 2
+
 # Create the main app
 app = FastAPI(title="Movie Discovery API", version="1.0.0")
 
@@ -37,23 +50,141 @@ class TMDBService:
         self.api_key = TMDB_API_KEY
         self.base_url = TMDB_BASE_URL
         self.image_base_url = TMDB_IMAGE_BASE_URL
+        self.cache_ttl = TMDB_CACHE_TTL
+        self.cache_max_entries = TMDB_CACHE_MAX_ENTRIES
+        self.snapshot_max_entries = TMDB_SNAPSHOT_MAX_ENTRIES
+        # Cache key -> (expires_at as unix timestamp, response payload),
+        # ordered from least to most recently used
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
         
         if not self.api_key:
             raise ValueError("TMDB_API_KEY environment variable is required")
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Make authenticated request to TMDB API"""
+    @staticmethod
+    def _cache_key(endpoint: str, params: Dict) -> str:
+        """Build a stable, unambiguous cache key from endpoint and query params"""
+        return json.dumps([endpoint, params], sort_keys=True, separators=(",", ":"))
+    
+    def _make_request(self, endpoint: str, params: Dict = None,
+                      add_image_urls: bool = False) -> Dict:
+        """Make authenticated request to TMDB API, serving from cache when fresh"""
         if params is None:
             params = {}
         
+        key = self._cache_key(endpoint, params)
+        cached = self._cache.get(key)
+        if cached:
+            if cached[0] > time.time():
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+        
         params['api_key'] = self.api_key
         
         try:
             response = requests.get(f"{self.base_url}{endpoint}", params=params)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.exceptions.RequestException as e:
             raise HTTPException(status_code=500, detail=f"TMDB API error: {str(e)}")
+        
+        # Enrich before caching; cached payloads must not be mutated afterwards
+        # because snapshots encode them from a worker thread
+        if add_image_urls:
+            self._add_image_urls(data)
+        
+        self._store(key, time.time() + self.cache_ttl, data)
+        return data
+    
+    def _add_image_urls(self, data: Dict) -> None:
+        """Add full poster and backdrop URLs to each result"""
+        for item in data.get("results", []):
+            if item.get("poster_path"):
+                item["poster_url"] = self.get_image_url(item["poster_path"])
+            if item.get("backdrop_path"):
+                item["backdrop_url"] = self.get_image_url(item["backdrop_path"], "w1280")
+    
+    def _store(self, key: str, expires_at: float, data: Dict) -> None:
+        """Insert a cache entry, evicting least recently used entries over the cap"""
+        self._cache[key] = (expires_at, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+    
+    def _evict_expired(self) -> None:
+        """Drop all expired entries from the cache"""
+        now = time.time()
+        for key in [k for k, v in self._cache.items() if v[0] <= now]:
+            del self._cache[key]
+    
+    def snapshot_entries(self) -> List[Tuple[str, Tuple[float, Dict]]]:
+        """Return the most recently used unexpired entries, oldest first"""
+        self._evict_expired()
+        if self.snapshot_max_entries <= 0:
+            return []
+        return list(self._cache.items())[-self.snapshot_max_entries:]
+    
+    @staticmethod
+    def write_snapshot(path: Path, entries: List[Tuple[str, Tuple[float, Dict]]]) -> None:
+        """Encode, compress and write snapshot entries to disk.
+        
+        Entries are encoded one at a time so that, when run in a worker
+        thread, the GIL is released between them and the event loop keeps
+        serving requests. The file is written to a temporary path and renamed
+        into place so a crash mid-write never leaves a truncated snapshot.
+        """
+        encoded = ",".join(
+            json.dumps(key) + ":" + json.dumps(entry, separators=(",", ":"))
+            for key, entry in entries
+        )
+        payload = f'{{"version":{TMDB_SNAPSHOT_VERSION},"entries":{{{encoded}}}}}'
+        
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(zlib.compress(payload.encode("utf-8")))
+        os.replace(tmp_path, path)
+    
+    def dump_snapshot(self, path: Path) -> int:
+        """Write unexpired cache entries to a snapshot file, returning the count"""
+        entries = self.snapshot_entries()
+        self.write_snapshot(path, entries)
+        return len(entries)
+    
+    def load_snapshot(self, path: Path) -> int:
+        """Load unexpired entries from a snapshot file into the cache.
+        
+        Missing, unreadable or incompatible snapshots are ignored. Returns the
+        number of entries loaded.
+        """
+        try:
+            snapshot = json.loads(zlib.decompress(path.read_bytes()))
+        except FileNotFoundError:
+            return 0
+        except (OSError, zlib.error, ValueError) as e:
+            logger.warning(f"Ignoring unreadable TMDB snapshot {path}: {e}")
+            return 0
+        
+        if not isinstance(snapshot, dict) or snapshot.get("version") != TMDB_SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring TMDB snapshot {path} with unsupported version")
+            return 0
+        
+        now = time.time()
+        fresh = []
+        try:
+            for key, entry in snapshot["entries"].items():
+                expires_at, data = entry
+                if not isinstance(expires_at, (int, float)) or not isinstance(data, dict):
+                    raise ValueError(f"malformed entry {key!r}")
+                if expires_at > now:
+                    fresh.append((key, expires_at, data))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring malformed TMDB snapshot {path}: {e}")
+            return 0
+        
+        # Snapshots are written least recently used first, so inserting in file
+        # order restores the LRU ordering
+        for key, expires_at, data in fresh:
+            self._store(key, expires_at, data)
+        return min(len(fresh), self.cache_max_entries)
     
     def get_popular_movies(self, page: int = 1) -> Dict:
         """Get popular movies"""
@@ -74,7 +205,7 @@ class TMDBService:
         if genre_ids:
             params["with_genres"] = ",".join(map(str, genre_ids))
         
-        return self._make_request("/discover/movie", params)
+        return self._make_request("/discover/movie", params, add_image_urls=True)
     
     def discover_tv_shows(self, genre_ids: List[int] = None, page: int = 1,
                          sort_by: str = "popularity.desc") -> Dict:
@@ -87,7 +218,7 @@ class TMDBService:
         if genre_ids:
             params["with_genres"] = ",".join(map(str, genre_ids))
         
-        return self._make_request("/discover/tv", params)
+        return self._make_request("/discover/tv", params, add_image_urls=True)
     
     def get_movie_genres(self) -> Dict:
         """Get list of movie genres"""
@@ -168,13 +299,6 @@ async def discover_content(request: DiscoverRequest):
         else:
             raise HTTPException(status_code=400, detail="content_type must be 'movie' or 'tv'")
         
-        # Add full image URLs
-        for item in data.get("results", []):
-            if item.get("poster_path"):
-                item["poster_url"] = tmdb_service.get_image_url(item["poster_path"])
-            if item.get("backdrop_path"):
-                item["backdrop_url"] = tmdb_service.get_image_url(item["backdrop_path"], "w1280")
-        
         return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -331,6 +455,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def snapshot_tmdb_cache_periodically():
+    """Persist the TMDB cache to disk every TMDB_SNAPSHOT_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(TMDB_SNAPSHOT_INTERVAL)
+        try:
+            # Only the cheap entry list copy happens on the event loop; encoding,
+            # compression and disk IO run in a worker thread
+            entries = tmdb_service.snapshot_entries()
+            write = asyncio.ensure_future(
+                asyncio.to_thread(tmdb_service.write_snapshot, TMDB_SNAPSHOT_PATH, entries)
+            )
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # The worker thread can't be interrupted; let it finish so the
+                # shutdown snapshot doesn't race an in-flight write
+                await asyncio.wait([write])
+                raise
+        except Exception:
+            logger.exception(f"Failed to write TMDB snapshot {TMDB_SNAPSHOT_PATH}")
+
+@app.on_event("startup")
+async def warm_tmdb_cache():
+    """Load the TMDB cache snapshot before serving traffic"""
+    started = time.perf_counter()
+    loaded = tmdb_service.load_snapshot(TMDB_SNAPSHOT_PATH)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Loaded {loaded} TMDB cache entries from {TMDB_SNAPSHOT_PATH} in {elapsed_ms:.1f} ms")
+    
+    app.state.snapshot_task = asyncio.create_task(snapshot_tmdb_cache_periodically())
+
+@app.on_event("shutdown")
+async def snapshot_tmdb_cache():
+    """Write a final TMDB cache snapshot so the next instance starts warm"""
+    snapshot_task = getattr(app.state, "snapshot_task", None)
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+        try:
+            await snapshot_task
+        except asyncio.CancelledError:
+            pass
+    
+    try:
+        written = tmdb_service.dump_snapshot(TMDB_SNAPSHOT_PATH)
+        logger.info(f"Wrote {written} TMDB cache entries to {TMDB_SNAPSHOT_PATH}")
+    except OSError as e:
+        logger.warning(f"Failed to write TMDB snapshot {TMDB_SNAPSHOT_PATH}: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
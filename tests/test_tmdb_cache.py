@@ -0,0 +1,223 @@
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def fake_response(payload):
+    response = mock.Mock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TMDBCacheTest(unittest.TestCase):
+    """Unit tests for the TMDB response cache and its on-disk snapshot"""
+
+    def setUp(self):
+        self.service = server.TMDBService()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = Path(self.tmp_dir.name) / "tmdb_cache.snapshot"
+
+        patcher = mock.patch.object(server.requests, "get")
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_raw_snapshot(self, snapshot):
+        self.snapshot_path.write_bytes(zlib.compress(json.dumps(snapshot).encode("utf-8")))
+
+    def test_cache_hit_skips_http_call(self):
+        self.mock_get.return_value = fake_response({"genres": [{"id": 28, "name": "Action"}]})
+
+        first = self.service.get_movie_genres()
+        second = self.service.get_movie_genres()
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.mock_get.call_count, 1)
+
+    def test_expired_entry_is_refetched(self):
+        self.mock_get.side_effect = [fake_response({"page": 1}), fake_response({"page": 2})]
+
+        self.service.get_popular_movies()
+        for key, (_, data) in list(self.service._cache.items()):
+            self.service._cache[key] = (time.time() - 1, data)
+
+        self.assertEqual(self.service.get_popular_movies(), {"page": 2})
+        self.assertEqual(self.mock_get.call_count, 2)
+
+    def test_cache_evicts_least_recently_used_over_cap(self):
+        self.service.cache_max_entries = 2
+        self.mock_get.side_effect = lambda *args, **kwargs: fake_response({})
+
+        self.service.discover_movies(page=1)
+        self.service.discover_movies(page=2)
+        self.service.discover_movies(page=1)
+        self.service.discover_movies(page=3)
+
+        self.assertEqual(len(self.service._cache), 2)
+        self.assertEqual(self.mock_get.call_count, 3)
+        self.service.discover_movies(page=1)
+        self.assertEqual(self.mock_get.call_count, 3)
+        self.service.discover_movies(page=2)
+        self.assertEqual(self.mock_get.call_count, 4)
+
+    def test_distinct_params_never_share_a_cache_key(self):
+        self.mock_get.side_effect = [fake_response({"query": 1}), fake_response({"query": 2})]
+
+        injected = self.service.discover_movies(sort_by="popularity.desc&with_genres=27")
+        horror = self.service.discover_movies(genre_ids=[27])
+
+        self.assertEqual(injected, {"query": 1})
+        self.assertEqual(horror, {"query": 2})
+        self.assertEqual(self.mock_get.call_count, 2)
+        self.assertNotEqual(
+            server.TMDBService._cache_key("/discover/movie", {"page": 1, "sort_by": "a&page=2"}),
+            server.TMDBService._cache_key("/discover/movie", {"page": 2, "sort_by": "a"}),
+        )
+
+    def test_discover_results_are_cached_with_image_urls(self):
+        self.mock_get.return_value = fake_response(
+            {"results": [{"poster_path": "/p.jpg", "backdrop_path": "/b.jpg"}]}
+        )
+
+        self.service.discover_tv_shows()
+        (_, cached), = self.service._cache.values()
+
+        self.assertEqual(cached["results"][0]["poster_url"], server.TMDB_IMAGE_BASE_URL + "w500/p.jpg")
+        self.assertEqual(cached["results"][0]["backdrop_url"], server.TMDB_IMAGE_BASE_URL + "w1280/b.jpg")
+
+    def test_snapshot_keeps_most_recently_used_entries(self):
+        self.service.snapshot_max_entries = 2
+        expires_at = time.time() + 60
+        for key in ["a", "b", "c"]:
+            self.service._store(key, expires_at, {})
+        self.service._cache.move_to_end("a")
+
+        self.assertEqual(self.service.dump_snapshot(self.snapshot_path), 2)
+
+        restored = server.TMDBService()
+        restored.load_snapshot(self.snapshot_path)
+        self.assertEqual(list(restored._cache), ["c", "a"])
+
+    def test_snapshot_round_trip_keeps_only_unexpired_entries(self):
+        now = time.time()
+        self.service._cache["fresh"] = (now + 60, {"results": [1]})
+        self.service._cache["stale"] = (now - 1, {"results": [2]})
+
+        self.assertEqual(self.service.dump_snapshot(self.snapshot_path), 1)
+        self.assertNotIn("stale", self.service._cache)
+
+        restored = server.TMDBService()
+        self.assertEqual(restored.load_snapshot(self.snapshot_path), 1)
+        self.assertEqual(list(restored._cache), ["fresh"])
+        self.assertEqual(restored._cache["fresh"][1], {"results": [1]})
+
+    def test_load_drops_entries_expired_since_dump(self):
+        now = time.time()
+        self.write_raw_snapshot({
+            "version": server.TMDB_SNAPSHOT_VERSION,
+            "entries": {"fresh": [now + 60, {}], "stale": [now - 1, {}]},
+        })
+
+        self.assertEqual(self.service.load_snapshot(self.snapshot_path), 1)
+        self.assertEqual(list(self.service._cache), ["fresh"])
+
+    def test_missing_snapshot_is_ignored(self):
+        self.assertEqual(self.service.load_snapshot(self.snapshot_path), 0)
+
+    def test_truncated_snapshot_is_ignored(self):
+        self.service._cache["fresh"] = (time.time() + 60, {"results": [1]})
+        self.service.dump_snapshot(self.snapshot_path)
+        data = self.snapshot_path.read_bytes()
+        self.snapshot_path.write_bytes(data[: len(data) // 2])
+
+        restored = server.TMDBService()
+        self.assertEqual(restored.load_snapshot(self.snapshot_path), 0)
+        self.assertEqual(len(restored._cache), 0)
+
+    def test_wrong_version_snapshot_is_ignored(self):
+        self.write_raw_snapshot({
+            "version": server.TMDB_SNAPSHOT_VERSION + 1,
+            "entries": {"fresh": [time.time() + 60, {}]},
+        })
+
+        self.assertEqual(self.service.load_snapshot(self.snapshot_path), 0)
+        self.assertEqual(len(self.service._cache), 0)
+
+    def test_malformed_snapshots_are_ignored(self):
+        future = time.time() + 60
+        malformed = [
+            [],
+            {"version": server.TMDB_SNAPSHOT_VERSION},
+            {"version": server.TMDB_SNAPSHOT_VERSION, "entries": []},
+            {"version": server.TMDB_SNAPSHOT_VERSION, "entries": {"key": [future]}},
+            {"version": server.TMDB_SNAPSHOT_VERSION, "entries": {"key": future}},
+            {"version": server.TMDB_SNAPSHOT_VERSION, "entries": {"key": ["soon", {}]}},
+            {"version": server.TMDB_SNAPSHOT_VERSION, "entries": {"key": [future, "data"]}},
+        ]
+        for snapshot in malformed:
+            with self.subTest(snapshot=snapshot):
+                self.write_raw_snapshot(snapshot)
+                self.assertEqual(self.service.load_snapshot(self.snapshot_path), 0)
+                self.assertEqual(len(self.service._cache), 0)
+
+
+class SnapshotLifecycleTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the startup/shutdown hooks and the periodic snapshot task"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        snapshot_path = Path(self.tmp_dir.name) / "tmdb_cache.snapshot"
+
+        for patcher in [
+            mock.patch.object(server, "TMDB_SNAPSHOT_PATH", snapshot_path),
+            mock.patch.object(server, "tmdb_service", server.TMDBService()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.saved_task = getattr(server.app.state, "snapshot_task", None)
+        if hasattr(server.app.state, "snapshot_task"):
+            del server.app.state.snapshot_task
+        self.addCleanup(setattr, server.app.state, "snapshot_task", self.saved_task)
+
+    async def test_shutdown_without_snapshot_task(self):
+        server.tmdb_service._store("fresh", time.time() + 60, {})
+
+        await server.snapshot_tmdb_cache()
+
+        self.assertTrue(server.TMDB_SNAPSHOT_PATH.exists())
+
+    async def test_periodic_snapshot_logs_failure_and_continues(self):
+        with mock.patch.object(server, "TMDB_SNAPSHOT_INTERVAL", 0), \
+                mock.patch.object(server.TMDBService, "write_snapshot",
+                                  side_effect=OSError("disk full")) as write, \
+                mock.patch.object(server.logger, "exception") as log_exception:
+            task = asyncio.create_task(server.snapshot_tmdb_cache_periodically())
+            for _ in range(100):
+                if write.call_count >= 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            self.assertFalse(task.done())
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertGreaterEqual(write.call_count, 2)
+        self.assertGreaterEqual(log_exception.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()